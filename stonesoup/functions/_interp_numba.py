@@ -0,0 +1,53 @@
+"""Numba compiled linear interpolation, used by :mod:`stonesoup.functions.interpolate` when the
+optional dependency `numba` is installed."""
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _interp_weights(xq, xp):
+    """Index of the sample point preceding each query point, and the weight of the sample point
+    following it."""
+    idx = np.searchsorted(xp, xq, side='right') - 1
+    idx = np.minimum(np.maximum(idx, 0), max(xp.shape[0] - 2, 0))
+    weights = np.empty(xq.shape[0])
+    for j in range(xq.shape[0]):
+        if xp.shape[0] > 1:
+            weights[j] = (xq[j] - xp[idx[j]]) / (xp[idx[j] + 1] - xp[idx[j]])
+        else:
+            weights[j] = 0.
+    return idx, weights
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def batch_interp(xq, xp, fp, out):
+    """Linearly interpolate each row of `fp`, sampled at `xp`, to the query points `xq`.
+
+    The search for each query point is performed once and shared across all rows, with the query
+    points blended in parallel. Each output column is written contiguously when `out` is in
+    column-major (Fortran) order.
+
+    Parameters
+    ----------
+    xq : :class:`numpy.ndarray` of shape (M,)
+        Query points
+    xp : :class:`numpy.ndarray` of shape (N,)
+        Sample points, increasing
+    fp : :class:`numpy.ndarray` of shape (D, N)
+        Sample values
+    out : :class:`numpy.ndarray` of shape (D, M)
+        Array the interpolated values are written to
+
+    Returns
+    -------
+    : :class:`numpy.ndarray` of shape (D, M)
+        `out`
+    """
+    idx, weights = _interp_weights(xq, xp)
+    last = xp.shape[0] - 1
+    for j in prange(xq.shape[0]):
+        i = idx[j]
+        next_i = min(i + 1, last)
+        for k in range(fp.shape[0]):
+            out[k, j] = fp[k, i] * (1 - weights[j]) + fp[k, next_i] * weights[j]
+    return out
@@ -1,13 +1,21 @@
 import copy
 import datetime
+import functools
 import warnings
-from typing import Union, List, Iterable
+from typing import Union, List, Iterable, Optional, Sequence, Tuple
 
 import numpy as np
 
-from ..types.array import StateVectors
+from ..types.array import StateVector
 from ..types.state import StateMutableSequence, State
 
+# Number of interpolated values (dimensions x times) from which the numba compiled interpolation
+# is used, if available. Below this, its import and compilation cost outweighs the saving.
+_NUMBA_MIN_SIZE = 1_000_000
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=datetime.timezone.utc)
+
 
 def time_range(start_time: datetime.datetime, end_time: datetime.datetime,
                timestep: datetime.timedelta = datetime.timedelta(seconds=1)) \
@@ -27,14 +35,143 @@ def time_range(start_time: datetime.datetime, end_time: datetime.datetime,
     Generator[datetime.datetime]
 
     """
-    duration = end_time - start_time
-    n_time_steps = duration / timestep
-    for x in range(int(n_time_steps) + 1):
-        yield start_time + x * timestep
+    if start_time.tzinfo is not None:
+        # NumPy datetime64 has no timezone representation
+        duration = end_time - start_time
+        n_time_steps = duration / timestep
+        for x in range(int(n_time_steps) + 1):
+            yield start_time + x * timestep
+    else:
+        yield from time_range_array(start_time, end_time, timestep).tolist()
+
+
+def time_range_array(start_time: datetime.datetime, end_time: datetime.datetime,
+                     timestep: datetime.timedelta = datetime.timedelta(seconds=1)) \
+        -> np.ndarray:
+    """
+    Produces an array of times between ``start_time`` (inclusive) and ``end_time`` (inclusive).
+    This is the array equivalent of :func:`time_range`, for use with timezone naive times.
+
+    Parameters
+    ----------
+    start_time: datetime.datetime   time range start (inclusive)
+    end_time: datetime.datetime     time range end (inclusive)
+    timestep: datetime.timedelta    default value is 1 second
+
+    Returns
+    -------
+    numpy.ndarray of numpy.datetime64[us]
+
+    """
+    n_time_steps = int((end_time - start_time) / timestep)
+    return np.datetime64(start_time, 'us') \
+        + np.arange(n_time_steps + 1) * np.timedelta64(timestep, 'us')
+
+
+def _timestamps_us(times: List[datetime.datetime]) -> np.ndarray:
+    """Convert times to integer microseconds since the epoch. Only the ordering and differences
+    of the values are meaningful; timezone aware times are relative to the UTC epoch."""
+    epoch = _EPOCH if not times or times[0].tzinfo is None else _EPOCH_UTC
+    microsecond = datetime.timedelta(microseconds=1)
+    return np.fromiter(((time - epoch) // microsecond for time in times),
+                       dtype=np.int64, count=len(times))
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_batch_interp():
+    """Numba compiled `batch_interp`, imported on first use. `None` if numba is not installed."""
+    try:
+        from ._interp_numba import batch_interp
+    except ImportError:
+        return None
+    return batch_interp
+
+
+def _batch_interp(xq: np.ndarray, xp: np.ndarray, fp: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Linearly interpolate each row of `fp`, sampled at increasing `xp`, to the query points
+    `xq`, writing the result to `out`. NumPy equivalent of the numba compiled `batch_interp`,
+    with one search shared across all rows and the blend done in place."""
+    idx = np.clip(np.searchsorted(xp, xq, side='right') - 1, 0, max(len(xp) - 2, 0))
+    next_idx = np.minimum(idx + 1, len(xp) - 1)
+    span = xp[next_idx] - xp[idx]
+    weights = np.divide(xq - xp[idx], span, out=np.zeros(len(xq)), where=span != 0) \
+        .astype(out.dtype, copy=False)
+    np.multiply(fp[:, idx], 1 - weights, out=out)
+    next_values = fp[:, next_idx]
+    np.multiply(next_values, weights, out=next_values)
+    np.add(out, next_values, out=out)
+    return out
+
+
+def _unique_states(sms: StateMutableSequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted unique timestamps of ``sms`` (see :func:`_timestamps_us`), and the index of the
+    state in ``sms`` for each. This ensures unique states for each timestamp: the last state for a
+    timestamp is used with earlier states not being used."""
+    all_timestamps = _timestamps_us([state.timestamp for state in sms.states])
+    state_timestamps, reversed_index = np.unique(all_timestamps[::-1], return_index=True)
+    return state_timestamps, len(all_timestamps) - 1 - reversed_index
+
+
+def _float_dtype(*dtypes: np.dtype, force_float64: bool = False) -> np.dtype:
+    """Float type to interpolate values of `dtypes` with. Single precision is kept if all values
+    are single precision, otherwise double precision is used."""
+    if not force_float64 and np.result_type(*set(dtypes)) == np.float32:
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def _state_vectors(states: List[State], dims: Optional[np.ndarray] = None,
+                   force_float64: bool = False) -> np.ndarray:
+    """Float state vectors of `states` as columns, restricted to the rows `dims` if given."""
+    if dims is None:
+        state_vectors = np.hstack([state.state_vector for state in states])
+    else:
+        state_vectors = np.hstack([state.state_vector[dims, :] for state in states])
+    state_vectors = np.asarray(state_vectors)
+    return state_vectors.astype(_float_dtype(state_vectors.dtype, force_float64=force_float64),
+                                copy=False)
+
+
+def _interpolate_state(sms: StateMutableSequence, time: datetime.datetime,
+                       dims: Optional[Union[slice, Sequence[int]]] = None,
+                       force_float64: bool = False) -> State:
+    """Interpolate a single state, with one search and blend of the two neighbouring states."""
+    max_state_time = sms[-1].timestamp
+    min_state_time = sms[0].timestamp
+    if not min_state_time <= time <= max_state_time:
+        raise IndexError(f"All times are outside of the state mutable sequence's time range "
+                         f"({min_state_time} -> {max_state_time})")
+
+    state_timestamps, state_indices = _unique_states(sms)
+    timestamp = _timestamps_us([time])[0]
+    index = np.searchsorted(state_timestamps, timestamp, side='right') - 1
+    previous_state = sms.states[state_indices[index]]
+    if state_timestamps[index] == timestamp:
+        return previous_state
+    next_state = sms.states[state_indices[index + 1]]
+
+    weight = (timestamp - state_timestamps[index]) \
+        / (state_timestamps[index + 1] - state_timestamps[index])
+    # Precision is chosen from all unique states, consistent with interpolating a list of times
+    dtype = _float_dtype(*(sms.states[index].state_vector.dtype for index in state_indices),
+                         force_float64=force_float64)
+    weight = dtype.type(weight)
+    previous_vector = np.asarray(previous_state.state_vector, dtype=dtype)
+    next_vector = np.asarray(next_state.state_vector, dtype=dtype)
+    if dims is None:
+        state_vector = previous_vector * (1 - weight) + next_vector * weight
+    else:
+        # Elements not interpolated are taken from the preceding state
+        state_vector = previous_vector.copy()
+        state_vector[dims, :] = previous_vector[dims, :] * (1 - weight) \
+            + next_vector[dims, :] * weight
+    return State(state_vector.view(StateVector), timestamp=time)
 
 
 def interpolate_state_mutable_sequence(sms: StateMutableSequence,
                                        times: Union[datetime.datetime, List[datetime.datetime]],
+                                       dims: Optional[Union[slice, Sequence[int]]] = None,
+                                       force_float64: bool = False,
                                        ) -> Union[StateMutableSequence, State]:
     """
     This function performs linear interpolation on a :class:`~.StateMutableSequence`. The function
@@ -47,6 +184,12 @@ def interpolate_state_mutable_sequence(sms: StateMutableSequence,
     :class:`~.StateMutableSequence` is returned with the states in the sequence corresponding to
     ``times``.
 
+    If ``dims`` is provided, only those state vector elements are interpolated. The remaining
+    elements of an interpolated state are copied from the preceding state in ``sms``.
+
+    Interpolated state vectors are single precision if all state vectors in ``sms`` are single
+    precision, unless ``force_float64`` is `True`, and double precision otherwise.
+
     Note
     ----
     This function does **not** extrapolate. Times outside the range of the time range of ``sms``
@@ -59,23 +202,15 @@ def interpolate_state_mutable_sequence(sms: StateMutableSequence,
     For :class:`~.Track` inputs the *metadatas* is removed as it can't be interpolated.
     """
 
-    # If single time is used, insert time into list and run again.
-    # A StateMutableSequence is produced by the inner function call.
-    # The single state is taken from that StateMutableSequence
+    # If single time is used, a single state is interpolated directly
     if isinstance(times, datetime.datetime):
-        new_sms = interpolate_state_mutable_sequence(sms, [times])
-        return new_sms.state
+        return _interpolate_state(sms, times, dims, force_float64)
 
     # Track metadata removed and no interpolation can be performed on the metadata
     new_sms = copy.copy(sms)
     if hasattr(new_sms, "metadatas"):
         new_sms.metadatas = list()
 
-    # This step ensure unique states for each timestamp. The last state for a timestamp is used
-    # with earlier states not being used.
-    time_state_dict = {state.timestamp: state
-                       for state in sms}
-
     # Filter times if required
     max_state_time = sms[-1].timestamp
     min_state_time = sms[0].timestamp
@@ -95,24 +230,64 @@ def interpolate_state_mutable_sequence(sms: StateMutableSequence,
 
         times = new_times
 
-    # Find times that require interpolation
-    times_to_interpolate = sorted(set(times).difference(time_state_dict.keys()))
+    state_timestamps, state_indices = _unique_states(sms)
+
+    # Find times that require interpolation, sorted and without duplicates
+    times_timestamps = _timestamps_us(times)
+    missing_indices = np.flatnonzero(~np.isin(times_timestamps, state_timestamps))
+
+    if len(missing_indices) == 0:
+        # No interpolation required, so states are taken directly from the sequence
+        new_sms.states = [
+            sms.states[index]
+            for index in state_indices[np.searchsorted(state_timestamps, times_timestamps)]]
+        return new_sms
+
+    interp_timestamps, unique_index = np.unique(times_timestamps[missing_indices],
+                                                return_index=True)
+    times_to_interpolate = [times[index] for index in missing_indices[unique_index]]
+
+    ndim = sms.state.ndim
+    state_values = [sms.states[index] for index in state_indices]
+    interp_dims = np.arange(ndim) if dims is None else np.arange(ndim)[dims]
+
+    state_vectors = _state_vectors(state_values, None if dims is None else interp_dims,
+                                   force_float64)
+
+    # Interpolate all state dimensions in a single pass, rather than one per dimension.
+    # Output is column-major, so each interpolated state vector is a contiguous column.
+    interp_output = np.empty((len(interp_dims), len(interp_timestamps)),
+                             dtype=state_vectors.dtype, order='F')
+    batch_interp = None
+    if interp_output.size >= _NUMBA_MIN_SIZE:
+        batch_interp = _numba_batch_interp()
+    (batch_interp or _batch_interp)(
+        interp_timestamps, state_timestamps, state_vectors, interp_output)
 
-    if len(times_to_interpolate) > 0:
-        # Only interpolate if required
-        state_vectors = StateVectors([state.state_vector for state in time_state_dict.values()])
-        state_timestamps = [time.timestamp() for time in time_state_dict.keys()]
-        interp_timestamps = [time.timestamp() for time in times_to_interpolate]
+    if dims is not None:
+        # Elements not interpolated are taken from the preceding state
+        previous_indices = np.searchsorted(state_timestamps, interp_timestamps, side='right') - 1
+        full_output = np.empty((ndim, len(interp_timestamps)), dtype=interp_output.dtype,
+                               order='F')
+        for column, previous_index in enumerate(previous_indices):
+            full_output[:, column] = state_values[previous_index].state_vector[:, 0]
+        full_output[interp_dims, :] = interp_output
+        interp_output = full_output
 
-        interp_output = np.empty((sms.state.ndim, len(times_to_interpolate)))
-        for element_index in range(sms.state.ndim):
-            interp_output[element_index, :] = np.interp(x=interp_timestamps,
-                                                        xp=state_timestamps,
-                                                        fp=state_vectors[element_index, :])
+    # Each (ndim, 1) column is viewed as a state vector directly, avoiding the shape checks
+    # of constructing a new StateVector for every interpolated state
+    interp_states = [State(state_vector.view(StateVector), timestamp=time)
+                     for state_vector, time in zip(interp_output.T[:, :, np.newaxis],
+                                                   times_to_interpolate)]
 
-        for state_index, time in enumerate(times_to_interpolate):
-            time_state_dict[time] = State(interp_output[:, state_index], timestamp=time)
+    # Gather output states by position in the sorted known timestamps (original and
+    # interpolated), rather than by datetime lookup
+    merged_timestamps = np.concatenate((state_timestamps, interp_timestamps))
+    merged_states = state_values + interp_states
+    merged_order = np.argsort(merged_timestamps)
+    output_indices = merged_order[
+        np.searchsorted(merged_timestamps[merged_order], times_timestamps)]
 
-    new_sms.states = [time_state_dict[time] for time in times]
+    new_sms.states = [merged_states[index] for index in output_indices]
 
     return new_sms
@@ -4,8 +4,11 @@ from typing import Tuple, List
 import numpy as np
 import pytest
 
-from ..interpolate import time_range, interpolate_state_mutable_sequence
+from .. import interpolate
+from ..interpolate import time_range, time_range_array, interpolate_state_mutable_sequence, \
+    _batch_interp
 from ...types.state import State, StateMutableSequence
+from ...types.track import Track
 
 
 @pytest.mark.parametrize("input_kwargs, expected",
@@ -37,6 +40,28 @@ def test_time_range(input_kwargs, expected):
     assert generated_times == expected
 
 
+def test_time_range_array():
+    start_time = datetime.datetime(2023, 1, 1, 0, 0)
+    end_time = datetime.datetime(2023, 1, 1, 0, 0, 1)
+    timestep = datetime.timedelta(seconds=0.3)
+
+    generated_times = time_range_array(start_time, end_time, timestep)
+
+    assert generated_times.dtype == np.dtype('datetime64[us]')
+    assert generated_times.tolist() == list(time_range(start_time, end_time, timestep))
+    assert len(generated_times) == 4
+
+
+def test_time_range_timezone_aware():
+    tz = datetime.timezone(datetime.timedelta(hours=-5))
+    start_time = datetime.datetime(2023, 1, 1, 0, 0, tzinfo=tz)
+
+    generated_times = list(time_range(start_time, start_time + datetime.timedelta(seconds=2)))
+
+    assert generated_times == [start_time + datetime.timedelta(seconds=x) for x in range(3)]
+    assert all(time.tzinfo is tz for time in generated_times)
+
+
 t0 = datetime.datetime(2023, 9, 1)
 t_max = t0 + datetime.timedelta(seconds=10)
 out_of_range_time = t_max + datetime.timedelta(seconds=10)
@@ -107,3 +132,189 @@ def test_interpolate_error(gen_test_data):
 
     with pytest.raises(IndexError):
         _ = interpolate_state_mutable_sequence(sms, time)
+
+
+def test_interpolate_duplicate_timestamps(gen_test_data):
+    sms, _ = gen_test_data
+    # Earlier duplicate should be ignored in favour of the later state
+    sms.insert(4, State([[0], [0], [0]], timestamp=sms[4].timestamp))
+    time = t0 + datetime.timedelta(seconds=0.9)
+
+    interp_state = interpolate_state_mutable_sequence(sms, time)
+
+    np.testing.assert_allclose(interp_state.state_vector, calculate_state(time).state_vector,
+                               rtol=1e-3, atol=1e-7)
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_batch_interp(use_numba):
+    if use_numba:
+        batch_interp = pytest.importorskip("stonesoup.functions._interp_numba").batch_interp
+    else:
+        batch_interp = _batch_interp
+
+    xp = np.array([0., 1., 2.5, 4.])
+    fp = np.array([[0., 2., 5., 8.],
+                   [1., -1., 3., 0.]])
+    xq = np.array([0., 0.5, 2., 3.9, 4.])
+    out = batch_interp(xq, xp, fp, np.empty((2, len(xq)), order='F'))
+
+    for row, fp_row in zip(out, fp):
+        np.testing.assert_allclose(row, np.interp(xq, xp, fp_row))
+
+
+def test_interpolate_numba_dispatch(gen_test_data, monkeypatch):
+    pytest.importorskip("numba")
+    sms, interp_times = gen_test_data
+    expected_sms = interpolate_state_mutable_sequence(sms, interp_times)
+
+    monkeypatch.setattr(interpolate, '_NUMBA_MIN_SIZE', 0)
+    new_sms = interpolate_state_mutable_sequence(sms, interp_times)
+
+    for state, expected_state in zip(new_sms, expected_sms):
+        np.testing.assert_allclose(state.state_vector, expected_state.state_vector)
+
+
+def test_interpolate_timezone_aware(gen_test_data):
+    sms, interp_times = gen_test_data
+    tz = datetime.timezone(datetime.timedelta(hours=3))
+    aware_sms = StateMutableSequence([State(state.state_vector,
+                                            timestamp=state.timestamp.replace(tzinfo=tz))
+                                      for state in sms])
+    aware_times = [time.replace(tzinfo=tz) for time in interp_times]
+
+    new_sms = interpolate_state_mutable_sequence(aware_sms, aware_times)
+
+    for state, time in zip(new_sms, interp_times):
+        np.testing.assert_allclose(state.state_vector, calculate_state(time).state_vector,
+                                   rtol=1e-3, atol=1e-7)
+
+
+def test_interpolate_integer_state_vectors():
+    sms = StateMutableSequence([State([[0], [10]], timestamp=t0),
+                                State([[1], [20]], timestamp=t0 + datetime.timedelta(seconds=2))])
+
+    interp_state = interpolate_state_mutable_sequence(sms, t0 + datetime.timedelta(seconds=1))
+
+    np.testing.assert_allclose(interp_state.state_vector, [[0.5], [15]])
+
+
+def test_interpolate_unsorted_duplicate_times(gen_test_data):
+    sms, _ = gen_test_data
+    times = [t0 + datetime.timedelta(seconds=seconds) for seconds in (2, 0.1, 2, 5.3, 0.1)]
+
+    new_sms = interpolate_state_mutable_sequence(sms, times)
+
+    assert [state.timestamp for state in new_sms] == times
+    assert new_sms[0] is sms[t0 + datetime.timedelta(seconds=2)]
+    assert new_sms[1] is new_sms[4]
+
+
+def test_interpolate_no_interpolation_required(gen_test_data):
+    sms, _ = gen_test_data
+    times = [sms[3].timestamp, sms[0].timestamp, sms[3].timestamp]
+
+    new_sms = interpolate_state_mutable_sequence(sms, times)
+
+    assert new_sms.states == [sms[3], sms[0], sms[3]]
+
+
+@pytest.mark.parametrize("dims, expected", [([0, 2], [[1], [10], [200]]),
+                                            (slice(1, 3), [[0], [15], [200]])])
+def test_interpolate_dims(dims, expected):
+    sms = StateMutableSequence([State([[0], [10], [100]], timestamp=t0),
+                                State([[4], [30], [500]], timestamp=t0 + datetime.timedelta(4))])
+
+    interp_state = interpolate_state_mutable_sequence(sms, t0 + datetime.timedelta(1), dims=dims)
+
+    np.testing.assert_allclose(interp_state.state_vector, expected)
+
+
+def test_interpolate_track(gen_test_data):
+    sms, interp_times = gen_test_data
+    track = Track(sms.states, id='track')
+    track.metadatas[0]['colour'] = 'red'
+    original_states = list(track.states)
+
+    new_track = interpolate_state_mutable_sequence(track, interp_times)
+
+    assert isinstance(new_track, Track)
+    assert new_track.id == 'track'
+    assert new_track.metadatas == []
+    assert len(new_track) == len(interp_times)
+    assert track.states == original_states
+    assert track.metadatas[0] == {'colour': 'red'}
+
+
+def test_interpolate_individual_time_matches_sequence(gen_test_data):
+    sms, interp_times = gen_test_data
+    new_sms = interpolate_state_mutable_sequence(sms, interp_times)
+
+    for time, state in zip(interp_times, new_sms):
+        interp_state = interpolate_state_mutable_sequence(sms, time)
+        assert interp_state.timestamp == time
+        np.testing.assert_allclose(interp_state.state_vector, state.state_vector)
+
+
+def test_interpolate_sequence_modified():
+    sms = StateMutableSequence([State([[0]], timestamp=t0),
+                                State([[2]], timestamp=t0 + datetime.timedelta(seconds=2))])
+    time = t0 + datetime.timedelta(seconds=1)
+    assert interpolate_state_mutable_sequence(sms, [time])[0].state_vector[0] == 1
+
+    # Appended state
+    sms.append(State([[6]], timestamp=t0 + datetime.timedelta(seconds=4)))
+    new_time = t0 + datetime.timedelta(seconds=3)
+    assert interpolate_state_mutable_sequence(sms, [new_time])[0].state_vector[0] == 4
+
+    # Replaced state
+    sms[0] = State([[-2]], timestamp=t0)
+    assert interpolate_state_mutable_sequence(sms, [time])[0].state_vector[0] == 0
+
+    # State modified in place
+    sms[1].state_vector[0] = 4
+    assert interpolate_state_mutable_sequence(sms, [time])[0].state_vector[0] == 1
+    assert interpolate_state_mutable_sequence(sms, time).state_vector[0] == 1
+
+    # Appended duplicate timestamp
+    sms.append(State([[10]], timestamp=t0 + datetime.timedelta(seconds=4)))
+    assert interpolate_state_mutable_sequence(sms, [new_time])[0].state_vector[0] == 7
+
+
+@pytest.mark.parametrize("force_float64", [False, True])
+@pytest.mark.parametrize("single_time", [False, True])
+def test_interpolate_float32(force_float64, single_time):
+    sms = StateMutableSequence([
+        State(np.array([[0], [10]], dtype=np.float32), timestamp=t0),
+        State(np.array([[1], [20]], dtype=np.float32),
+              timestamp=t0 + datetime.timedelta(seconds=2))])
+    time = t0 + datetime.timedelta(seconds=1)
+
+    if single_time:
+        interp_state = interpolate_state_mutable_sequence(
+            sms, time, force_float64=force_float64)
+    else:
+        interp_state = interpolate_state_mutable_sequence(
+            sms, [time], force_float64=force_float64)[0]
+
+    assert interp_state.state_vector.dtype == (np.float64 if force_float64 else np.float32)
+    np.testing.assert_allclose(interp_state.state_vector, [[0.5], [15]])
+
+
+@pytest.mark.parametrize("single_time", [False, True])
+def test_interpolate_mixed_precision(single_time):
+    sms = StateMutableSequence([
+        State(np.array([[0], [10]], dtype=np.float32), timestamp=t0),
+        State(np.array([[1], [20]], dtype=np.float32),
+              timestamp=t0 + datetime.timedelta(seconds=2)),
+        State(np.array([[2], [30]], dtype=np.float64),
+              timestamp=t0 + datetime.timedelta(seconds=4))])
+    time = t0 + datetime.timedelta(seconds=1)
+
+    if single_time:
+        interp_state = interpolate_state_mutable_sequence(sms, time)
+    else:
+        interp_state = interpolate_state_mutable_sequence(sms, [time])[0]
+
+    assert interp_state.state_vector.dtype == np.float64
+    np.testing.assert_allclose(interp_state.state_vector, [[0.5], [15]])